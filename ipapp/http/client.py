@@ -99,8 +99,11 @@ class Client(Component, ClientServerAnnotator):
     async def prepare(self) -> None:
         pass
 
+    def _get_session_kwargs(self) -> Dict[str, Any]:
+        return dict(self._session_kwargs or {})
+
     async def start(self) -> None:
-        _session_kwargs = self._session_kwargs or {}
+        _session_kwargs = self._get_session_kwargs()
         timeout = getattr(self.cfg, 'timeout', None)
         if timeout:
             _session_kwargs.update({'timeout': ClientTimeout(timeout)})
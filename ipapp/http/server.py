@@ -71,6 +71,17 @@ class ServerConfig(BaseModel):
         ),
     )
     backlog: int = Field(128, description="Максимально количество соединений")
+    keepalive_timeout: Optional[float] = Field(
+        None,
+        description=(
+            "Время удержания неактивного keep-alive соединения "
+            "(по умолчанию - значение aiohttp)"
+        ),
+        example=75.0,
+    )
+    access_log: bool = Field(
+        True, description="Запись access-лога HTTP сервера"
+    )
     reuse_address: Optional[bool] = Field(
         None,
         description=(
@@ -232,13 +243,17 @@ class Server(Component, ClientServerAnnotator):
                 graceful_timeout=cfg.graceful_timeout,
                 close_timeout=self.shutdown_timeout,
             )
+        runner_kwargs: Dict[str, Any] = {}
+        if cfg.keepalive_timeout is not None:
+            runner_kwargs['keepalive_timeout'] = cfg.keepalive_timeout
         self.runner = AppRunner(
             self.web_app,
             handle_signals=True,
             access_log_class=AccessLogger,
             access_log_format=AccessLogger.LOG_FORMAT,
-            access_log=access_logger,
+            access_log=access_logger if cfg.access_log else None,
             shutdown_timeout=self.shutdown_timeout,
+            **runner_kwargs,
         )
         self.web_app.middlewares.append(self._middleware)
 
@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import datetime
 import json
 import string
@@ -36,6 +35,11 @@ import ipapp.logger.span  # noqa
 
 from .ctx import app, request, span, span_trap
 
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode  # type: ignore
+
 BASE64_MARKER = 'b64enc##'
 
 
@@ -47,7 +51,7 @@ def from_bytes(o: bytes) -> str:
     try:
         return o.decode()
     except UnicodeError:
-        b64_data = base64.b64encode(o).decode()
+        b64_data = b64encode(o).decode()
         return f"{BASE64_MARKER}{b64_data}"
 
 
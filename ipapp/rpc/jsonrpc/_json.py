@@ -0,0 +1,24 @@
+import json
+import re
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# orjson turns integers wider than 64 bit into floats, leave such input
+# (and anything else with a long run of digits) to the stdlib
+_LONG_DIGITS = re.compile(rb'\d{19}')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        raw = data.encode() if isinstance(data, str) else data
+        if _LONG_DIGITS.search(raw) is None:
+            try:
+                return orjson.loads(raw)
+            except ValueError:
+                # NaN, Infinity and other input rejected by orjson
+                pass
+    return json.loads(data)
@@ -1,7 +1,8 @@
 from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Type, Union
 
-from aiohttp import ClientTimeout
+from aiohttp import ClientTimeout, TCPConnector
 from pydantic import BaseModel, Field
+from yarl import URL
 
 from ipapp.http.client import Client, ClientConfig
 from ipapp.rpc.jsonrpc.main import JsonRpcCall
@@ -13,6 +14,27 @@ from ..error import JsonRpcError
 class JsonRpcHttpClientConfig(ClientConfig):
     url: str = Field("http://0:8080/", description="Адрес JSON-RPC сервера")
     timeout: float = Field(60.0, description="Таймаут JSON-RPC вызова")
+    connection_limit: int = Field(
+        100,
+        ge=0,
+        description=(
+            "Максимальное количество одновременных соединений "
+            "(0 - без ограничений)"
+        ),
+    )
+    connection_limit_per_host: int = Field(
+        0,
+        ge=0,
+        description=(
+            "Максимальное количество одновременных соединений с одним "
+            "хостом (0 - без ограничений)"
+        ),
+    )
+    keepalive_timeout: float = Field(
+        15.0,
+        ge=0,
+        description="Время удержания неактивного keep-alive соединения",
+    )
 
 
 class JsonRpcHttpClient(Client):
@@ -26,6 +48,7 @@ class JsonRpcHttpClient(Client):
     ) -> None:
         super().__init__(cfg, session_kwargs=session_kwargs)
         self.cfg = cfg
+        self._url = URL(cfg.url)
 
     async def prepare(self) -> None:
         self.clt = _JsonRpcClient(
@@ -34,6 +57,16 @@ class JsonRpcHttpClient(Client):
             exception_mapping_callback=self._raise_jsonrpc_error,
         )
 
+    def _get_session_kwargs(self) -> Dict[str, Any]:
+        session_kwargs = super()._get_session_kwargs()
+        if 'connector' not in session_kwargs:
+            session_kwargs['connector'] = TCPConnector(
+                limit=self.cfg.connection_limit,
+                limit_per_host=self.cfg.connection_limit_per_host,
+                keepalive_timeout=self.cfg.keepalive_timeout,
+            )
+        return session_kwargs
+
     def _raise_jsonrpc_error(
         self,
         code: Optional[int] = None,
@@ -68,7 +101,7 @@ class JsonRpcHttpClient(Client):
             _clt_timeout = ClientTimeout(_timeout)
 
         resp = await self.request(
-            'POST', self.cfg.url, body=request, timeout=_clt_timeout
+            'POST', self._url, body=request, timeout=_clt_timeout
         )
 
         return resp._body
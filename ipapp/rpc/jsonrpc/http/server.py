@@ -4,7 +4,7 @@ from typing import Dict, List, Optional, Union
 
 from aiohttp import web
 from multidict import CIMultiDict
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from ipapp.http.server import ServerHandler as _ServerHandler
 from ipapp.rpc.jsonrpc.main import JsonRpcExecutor
@@ -52,6 +52,11 @@ class JsonRpcHttpHandlerConfig(BaseModel):
     discover_enabled: bool = True
     cors_enabled: bool = True
     cors_origin: str = 'https://playground.open-rpc.org'
+    max_batch_size: int = Field(
+        100,
+        ge=0,
+        description="Максимальный размер batch запроса, 0 - без ограничений",
+    )
 
 
 class JsonRpcHttpHandler(_ServerHandler):
@@ -76,6 +81,7 @@ class JsonRpcHttpHandler(_ServerHandler):
             discover_enabled=self._cfg.discover_enabled,
             servers=self._servers,
             external_docs=self._external_docs,
+            max_batch_size=self._cfg.max_batch_size,
         )
         if self._cfg.healthcheck_path:
             self._setup_healthcheck(self._cfg.healthcheck_path)
@@ -107,11 +113,15 @@ class JsonRpcHttpHandler(_ServerHandler):
         response_set_cookies_token = response_set_cookies.set([])
         response_del_cookies_token = response_del_cookies.set([])
         resp_body = await self._rpc.exec(req_body)
-        resp = web.Response(
-            body=resp_body,
-            content_type='application/json',
-            headers=self._get_cors_headers(),
-        )
+        if resp_body:
+            resp = web.Response(
+                body=resp_body,
+                content_type='application/json',
+                headers=self._get_cors_headers(),
+            )
+        else:
+            # notification or notification-only batch: nothing to return
+            resp = web.Response(status=204, headers=self._get_cors_headers())
 
         set_headers = response_set_headers.get()
         resp.headers.extend(set_headers)
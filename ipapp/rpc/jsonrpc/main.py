@@ -45,6 +45,7 @@ from ipapp.rpc.main import Executor as _Executor
 from ipapp.rpc.main import RpcRegistry
 
 from ..const import SPAN_TAG_RPC_CODE, SPAN_TAG_RPC_METHOD
+from . import _json
 from .error import JsonRpcError
 from .openrpc.discover import discover
 from .openrpc.models import ExternalDocs, Server
@@ -78,6 +79,7 @@ class JsonRpcExecutor:
         scheduler_kwargs: Optional[Dict[str, Any]] = None,
         servers: Optional[List[Server]] = None,
         external_docs: Optional[ExternalDocs] = None,
+        max_batch_size: Optional[int] = None,
     ) -> None:
         self._registry = registry
         self._app = app
@@ -91,6 +93,7 @@ class JsonRpcExecutor:
 
         self._servers: Optional[List[Server]] = servers
         self._external_docs: Optional[ExternalDocs] = external_docs
+        self._max_batch_size = max_batch_size
 
     async def start_scheduler(self) -> None:
         self._scheduler = aiojobs.Scheduler(**self._scheduler_kwargs)
@@ -173,7 +176,7 @@ class JsonRpcExecutor:
             )
 
         try:
-            return self._protocol.parse_request(request)
+            req = self._protocol.parse_request(request)
         except (JSONRPCInvalidRequestError, JSONRPCParseError) as err:
             if isinstance(err, JSONRPCInvalidRequestError):
                 old = self._old_parse_request(request)
@@ -184,13 +187,31 @@ class JsonRpcExecutor:
             self._set_span_err(err)
             raise
 
+        if (
+            self._max_batch_size
+            and isinstance(req, rpc.JSONRPCBatchRequest)
+            and len(req) > self._max_batch_size
+        ):
+            try:
+                raise JSONRPCInvalidRequestError(
+                    data={
+                        'info': 'Batch size exceeds %d' % self._max_batch_size
+                    }
+                )
+            except JSONRPCInvalidRequestError as err:
+                self._set_span_method(None)
+                self._set_span_err(err)
+                raise
+
+        return req
+
     def _old_parse_request(
         self, request: bytes
     ) -> Optional[rpc.JSONRPCRequest]:
         # TODO поддержка старого формата
 
         try:
-            data = json.loads(request)
+            data = _json.loads(request)
         except Exception:
             return None
 
@@ -346,7 +367,7 @@ class JsonRpcExecutor:
             external_docs=self._external_docs,
         )
 
-        self._discover_result = json.loads(
+        self._discover_result = _json.loads(
             result.json(by_alias=True, exclude_unset=True)
         )
 
@@ -670,7 +691,7 @@ class JsonRpcClient:
                 return None
 
             try:
-                rep = json.loads(result)
+                rep = _json.loads(result)
             except Exception as err:
                 self._raise_jsonrpc_error(message='Invalid reply: %s' % err)
 
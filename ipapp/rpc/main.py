@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import binascii
 import inspect
 import warnings
@@ -35,12 +34,17 @@ from ipapp.misc import BASE64_MARKER
 
 from .error import InvalidArguments, MethodNotFound, RpcError
 
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode  # type: ignore
+
 
 def to_bytes(value: str) -> Union[str, bytes]:
     if value.startswith(BASE64_MARKER):
         value_ = value[len(BASE64_MARKER) :]
         try:
-            return base64.b64decode(value_, validate=True)
+            return b64decode(value_, validate=True)
         except binascii.Error:
             pass
     return value
@@ -321,6 +325,13 @@ class _Method:
         self._validators: Dict[str, dict] = {}
         if hasattr(func, '__validators__'):
             self._validators = func.__validators__
+        # method without any arguments: nothing to validate
+        self._is_nullary = (
+            not self.params_order
+            and not self.is_kwargs
+            and not self._validators
+            and (self._model is None or not self._model.__fields__)
+        )
 
     def _analyse_arguments(self, func: Callable) -> None:
         is_method = isinstance(func, MethodType)
@@ -381,6 +392,8 @@ class _Method:
             )
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self._is_nullary and not args and not kwargs:
+            return self.func()
         _kwargs = self._validate_arguments(args, kwargs)
         return self.func(**_kwargs)
 
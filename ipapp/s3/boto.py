@@ -124,6 +124,7 @@ class Client:
         self.base_client_creator = base_client_creator
         self.bucket_name = bucket_name
         self.allowed_types = allowed_types
+        self._allowed_types_set = frozenset(allowed_types)
 
     async def __aenter__(self) -> 'Client':
         self.base_client = await self.base_client_creator.__aenter__()
@@ -391,7 +392,7 @@ class Client:
                 filetypes = [ft[1:] for ft in filetypes]
             else:
                 filetypes = [mime_type_.split('/')[-1]]
-            int_set = set(filetypes) & set(self.allowed_types)
+            int_set = set(filetypes) & self._allowed_types_set
             if not int_set:
                 raise FileTypeNotAllowedError
             filetype = int_set.pop()
@@ -3,7 +3,12 @@ import json
 import os
 from uuid import UUID
 
+import pytest
+
+import ipapp.misc
+import ipapp.rpc.main
 from ipapp.misc import BASE64_MARKER, json_encode
+from ipapp.rpc.main import to_bytes
 
 
 class CustomUUID(UUID):
@@ -23,3 +28,19 @@ def test_encode_bytes() -> None:
     enc_data_ = json.loads(enc_data)[len(BASE64_MARKER) :]
     bytes_from_enc_data = base64.b64decode(enc_data_.encode())
     assert data == bytes_from_enc_data
+
+
+@pytest.mark.parametrize('codec_name', ['pybase64', 'base64'])
+def test_bytes_roundtrip(codec_name, monkeypatch) -> None:
+    if codec_name == 'pybase64':
+        codec = pytest.importorskip('pybase64')
+    else:
+        codec = base64
+    monkeypatch.setattr(ipapp.misc, 'b64encode', codec.b64encode)
+    monkeypatch.setattr(ipapp.rpc.main, 'b64decode', codec.b64decode)
+
+    data = os.urandom(100)
+    assert to_bytes(json.loads(json_encode(data))) == data
+
+    invalid = BASE64_MARKER + '!!'
+    assert to_bytes(invalid) == invalid
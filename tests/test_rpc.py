@@ -82,6 +82,33 @@ async def test_validation():
         await ex.exec('sum', kwargs={'a': 'd', 'b': 4})
 
 
+async def test_exec_no_params():
+    reg = RpcRegistry()
+
+    @reg.method()
+    async def ping() -> str:
+        return 'pong'
+
+    ex = Executor(reg)
+    assert await ex.exec('ping') == 'pong'
+    with pytest.raises(InvalidArguments):
+        await ex.exec('ping', kwargs={'a': 1})
+    with pytest.raises(InvalidArguments):
+        await ex.exec('ping', args=[1])
+
+
+async def test_exec_varargs_required():
+    reg = RpcRegistry()
+
+    @reg.method()
+    async def total(*args: int) -> int:
+        return sum(args)
+
+    ex = Executor(reg)
+    with pytest.raises(InvalidArguments):
+        await ex.exec('total')
+
+
 async def test_type_casting():
     reg = RpcRegistry()
 
@@ -1,11 +1,25 @@
+import asyncio
 import json
+import math
 from typing import Optional
 
+import pytest
 from pydantic.main import BaseModel
 
 from ipapp import BaseApplication, BaseConfig
 from ipapp.rpc import RpcRegistry
 from ipapp.rpc.jsonrpc import JsonRpcClient, JsonRpcError, JsonRpcExecutor
+from ipapp.rpc.jsonrpc import _json as jsonrpc_json
+
+
+@pytest.fixture(autouse=True, params=['orjson', 'json'])
+def json_backend(request, monkeypatch):
+    if request.param == 'orjson':
+        if jsonrpc_json.orjson is None:
+            pytest.skip('orjson is not installed')
+    else:
+        monkeypatch.setattr(jsonrpc_json, 'orjson', None)
+    return request.param
 
 
 def get_app():
@@ -386,6 +400,66 @@ async def test_batch_complicated():
     ]
 
 
+async def test_batch_concurrent():
+    reg = RpcRegistry()
+    ev = asyncio.Event()
+
+    @reg.method()
+    async def wait() -> str:
+        await ev.wait()
+        return 'waited'
+
+    @reg.method()
+    async def release() -> str:
+        ev.set()
+        return 'released'
+
+    ex = JsonRpcExecutor(reg, get_app())
+    res = await asyncio.wait_for(
+        ex.exec(
+            b'[{"jsonrpc": "2.0", "method": "wait", "id": 1},'
+            b'{"jsonrpc": "2.0", "method": "release", "id": 2}]'
+        ),
+        5,
+    )
+
+    assert json.loads(res) == [
+        {"jsonrpc": "2.0", "id": 1, "result": "waited"},
+        {"jsonrpc": "2.0", "id": 2, "result": "released"},
+    ]
+
+
+async def test_batch_too_large():
+    reg = RpcRegistry()
+    calls = []
+
+    @reg.method()
+    async def echo(text: str) -> str:
+        calls.append(text)
+        return 'echo: %s' % text
+
+    ex = JsonRpcExecutor(reg, get_app(), max_batch_size=2)
+    res = await ex.exec(
+        b'[{"jsonrpc": "2.0", '
+        b'"method": "echo", "params": {"text": "1"}, "id": 1},'
+        b'{"jsonrpc": "2.0", '
+        b'"method": "echo", "params": {"text": "2"}, "id": 2},'
+        b'{"jsonrpc": "2.0", '
+        b'"method": "echo", "params": {"text": "3"}, "id": 3}]'
+    )
+
+    assert json.loads(res) == {
+        "jsonrpc": "2.0",
+        "id": None,
+        "error": {
+            "message": "Invalid Request",
+            "code": -32600,
+            "data": {"info": "Batch size exceeds 2"},
+        },
+    }
+    assert calls == []
+
+
 async def test_clt_single():
     reg = RpcRegistry()
 
@@ -414,6 +488,37 @@ async def test_clt_batch():
     assert result == (3, 7)
 
 
+async def test_clt_batch_non_finite():
+    reg = RpcRegistry()
+
+    @reg.method()
+    async def nan() -> float:
+        return float('nan')
+
+    @reg.method()
+    async def inf() -> float:
+        return float('inf')
+
+    clt = get_clt(reg)
+
+    result = await clt.exec_batch(clt.exec('nan'), clt.exec('inf'))
+    assert math.isnan(result[0])
+    assert result[1] == float('inf')
+
+
+async def test_clt_batch_big_int():
+    reg = RpcRegistry()
+
+    @reg.method()
+    async def big() -> int:
+        return 2**70
+
+    clt = get_clt(reg)
+
+    result = await clt.exec_batch(clt.exec('big'), clt.exec('big'))
+    assert result == (2**70, 2**70)
+
+
 async def test_clt_single_err_params():
     reg = RpcRegistry()
 
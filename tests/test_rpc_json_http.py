@@ -4,8 +4,8 @@ import os
 from typing import Any, Awaitable, Optional
 
 import pytest
-from aiohttp import ClientSession, ClientTimeout
-from pydantic import BaseModel
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from pydantic import BaseModel, ValidationError
 from pydantic.fields import FieldInfo
 
 from ipapp import BaseApplication, BaseConfig
@@ -236,6 +236,78 @@ async def test_batch_complicated(unused_tcp_port):
             ]
 
 
+async def test_batch_notifications_only(unused_tcp_port):
+    reg = RpcRegistry()
+
+    @reg.method()
+    def notify(msg: str):
+        return 'ok'
+
+    async with runapp(
+        unused_tcp_port, JsonRpcHttpHandler(reg, JsonRpcHttpHandlerConfig())
+    ):
+        async with ClientSession() as sess:
+            resp = await sess.request(
+                'POST',
+                'http://127.0.0.1:%s/' % unused_tcp_port,
+                json=[
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "notify",
+                        "params": {"msg": "hello"},
+                    },
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "notify",
+                        "params": {"msg": "world"},
+                    },
+                ],
+            )
+
+            assert resp.status == 204
+            assert await resp.read() == b''
+
+
+def test_max_batch_size_config():
+    assert JsonRpcHttpHandlerConfig().max_batch_size == 100
+    assert JsonRpcHttpHandlerConfig(max_batch_size=0).max_batch_size == 0
+    with pytest.raises(ValidationError):
+        JsonRpcHttpHandlerConfig(max_batch_size=-1)
+
+
+async def test_rpc_client_connector():
+    clt = JsonRpcHttpClient(
+        JsonRpcHttpClientConfig(
+            connection_limit=10,
+            connection_limit_per_host=2,
+            keepalive_timeout=5.0,
+        )
+    )
+    await clt.start()
+    try:
+        connector = clt._session.connector
+        assert isinstance(connector, TCPConnector)
+        assert connector.limit == 10
+        assert connector.limit_per_host == 2
+        assert connector._keepalive_timeout == 5.0
+    finally:
+        await clt.stop()
+
+
+async def test_rpc_client_custom_connector():
+    connector = TCPConnector(limit=7)
+    clt = JsonRpcHttpClient(
+        JsonRpcHttpClientConfig(connection_limit=10),
+        session_kwargs={'connector': connector},
+    )
+    await clt.start()
+    try:
+        assert clt._session.connector is connector
+        assert connector.limit == 7
+    finally:
+        await clt.stop()
+
+
 async def test_rpc_client(unused_tcp_port):
     reg = RpcRegistry()
 
@@ -1,5 +1,6 @@
 import mimetypes
-from typing import Any, AsyncGenerator, Dict, Optional
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
 from uuid import uuid4
 
 import pytest
@@ -26,6 +27,11 @@ async def s3() -> AsyncGenerator[S3, None]:
     await app.stop()
 
 
+@lru_cache(maxsize=64)
+def file_types_for(content_type: str) -> Tuple[str, ...]:
+    return tuple(ft[1:] for ft in mimetypes.guess_all_extensions(content_type))
+
+
 async def save(
     s3: S3,
     uuid: str,
@@ -35,8 +41,7 @@ async def save(
     metadata: Dict[str, Any],
     mime_type: Optional[str] = None,
 ) -> None:
-    file_types = mimetypes.guess_all_extensions(content_type)
-    file_types = [ft[1:] for ft in file_types]
+    file_types = file_types_for(content_type)
     file_type = set(file_types) & set(s3.allowed_types)
     if file_type:
         file_type = file_type.pop()
@@ -1,8 +1,10 @@
+import os
 import time
 import uuid
-from asyncio import Future, wait_for
+from asyncio import Future, sleep, wait_for
 from datetime import datetime, timezone
 from functools import wraps
+from typing import AsyncGenerator
 
 import asyncpg
 import pytest
@@ -23,68 +25,72 @@ from ipapp.task.db import (
 )
 
 
-async def connect(postgres_url) -> asyncpg.Connection:
-    conn = await asyncpg.connect(postgres_url)
-    await Postgres._conn_init(conn)
-    return conn
+@pytest.fixture
+async def pg_pool(postgres_url: str) -> AsyncGenerator[asyncpg.Pool, None]:
+    pool = await asyncpg.create_pool(
+        postgres_url, min_size=1, max_size=2, init=Postgres._conn_init
+    )
+    yield pool
+    await pool.close()
 
 
-async def prepare(postgres_url, with_trace_id: bool = False) -> str:
+async def prepare(pool: asyncpg.Pool, with_trace_id: bool = False) -> str:
     test_schema_name = 'testdbtm'
-    conn = await connect(postgres_url)
-    await conn.execute('DROP SCHEMA IF EXISts %s CASCADE' % test_schema_name)
-    await conn.execute('CREATE SCHEMA %s' % test_schema_name)
-    if not with_trace_id:
-        await conn.execute(CREATE_TABLE_QUERY.format(schema=test_schema_name))
-        await conn.execute(
-            'ALTER TABLE %s.task DROP COLUMN trace_id' % test_schema_name
-        )
+    worker_id = os.environ.get('PYTEST_XDIST_WORKER')
+    if worker_id:
+        # separate schema per pytest-xdist worker
+        test_schema_name = '%s_%s' % (test_schema_name, worker_id)
+    async with pool.acquire() as conn:
         await conn.execute(
-            'ALTER TABLE %s.task DROP COLUMN trace_span_id' % test_schema_name
+            'DROP SCHEMA IF EXISts %s CASCADE' % test_schema_name
         )
-    await conn.close()
+        await conn.execute('CREATE SCHEMA %s' % test_schema_name)
+        if not with_trace_id:
+            await conn.execute(
+                CREATE_TABLE_QUERY.format(schema=test_schema_name)
+            )
+            await conn.execute(
+                'ALTER TABLE %s.task DROP COLUMN trace_id, '
+                'DROP COLUMN trace_span_id' % test_schema_name
+            )
     return test_schema_name
 
 
-async def get_tasks_pending(postgres_url, schema) -> list:
-    conn = await connect(postgres_url)
-    res = await conn.fetch(
+async def get_tasks_pending(pool: asyncpg.Pool, schema) -> list:
+    return await pool.fetch(
         'SELECT * FROM %s.task_pending ORDER BY id' % schema
     )
-    await conn.close()
-    return res
 
 
-async def get_tasks_arch(postgres_url, schema) -> list:
-    conn = await connect(postgres_url)
-    res = await conn.fetch('SELECT * FROM %s.task_arch ORDER BY id' % schema)
-    await conn.close()
-    return res
+async def get_tasks_pending_count(pool: asyncpg.Pool, schema) -> int:
+    return await pool.fetchval('SELECT count(*) FROM %s.task_pending' % schema)
+
 
+async def get_tasks_arch(pool: asyncpg.Pool, schema) -> list:
+    return await pool.fetch('SELECT * FROM %s.task_arch ORDER BY id' % schema)
 
-async def get_tasks_by_reference(postgres_url, schema, reference) -> list:
-    conn = await connect(postgres_url)
-    res = await conn.fetch(
+
+async def get_tasks_by_reference(
+    pool: asyncpg.Pool, schema, reference
+) -> list:
+    return await pool.fetch(
         'SELECT * FROM %s.task WHERE reference=$1 ORDER BY id' % schema,
         reference,
     )
-    await conn.close()
-    return res
 
 
-async def get_tasks_log(postgres_url, schema) -> list:
-    conn = await connect(postgres_url)
-    res = await conn.fetch('SELECT * FROM %s.task_log ORDER BY id' % schema)
-    await conn.close()
-    return res
+async def get_tasks_log(pool: asyncpg.Pool, schema) -> list:
+    return await pool.fetch('SELECT * FROM %s.task_log ORDER BY id' % schema)
 
 
-async def wait_no_pending(postgres_url, schema):
+async def wait_no_pending(pool: asyncpg.Pool, schema):
     start = time.time()
+    delay = 0.02
     while time.time() < start + 10:
-        tasks = await get_tasks_pending(postgres_url, schema)
-        if len(tasks) == 0:
+        if await get_tasks_pending_count(pool, schema) == 0:
             return
+        await sleep(delay)
+        delay = min(delay * 1.5, 0.2)
     raise TimeoutError()
 
 
@@ -92,8 +98,10 @@ async def wait_no_pending(postgres_url, schema):
     "with_trace_id",
     [True, False],
 )
-async def test_success(postgres_url: str, with_trace_id: bool):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+async def test_success(
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
+):
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
 
@@ -120,37 +128,40 @@ async def test_success(postgres_url: str, with_trace_id: bool):
     tm: TaskManager = app.get('tm')  # type: ignore
 
     await tm.schedule(test, {'arg': 123}, eta=time.time() + 3)
-    tasks = await get_tasks_pending(postgres_url, test_schema_name)
+    tasks = await get_tasks_pending(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'test'
     assert tasks[0]['params'] == {'arg': 123}
-    assert tasks[0]['eta'] > datetime.now(tz=timezone.utc)
-    assert tasks[0]['last_stamp'] < datetime.now(tz=timezone.utc)
+    assert tasks[0]['eta'] > now
+    assert tasks[0]['last_stamp'] < now
     assert tasks[0]['status'] == STATUS_PENDING
     assert tasks[0]['retries'] is None
 
     res = await wait_for(fut, 10)
     assert res == 123
 
-    tasks = await get_tasks_arch(postgres_url, test_schema_name)
+    tasks = await get_tasks_arch(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'test'
     assert tasks[0]['params'] == {'arg': 123}
-    assert tasks[0]['eta'] < datetime.now(tz=timezone.utc)
-    assert tasks[0]['last_stamp'] < datetime.now(tz=timezone.utc)
+    assert tasks[0]['eta'] < now
+    assert tasks[0]['last_stamp'] < now
     assert tasks[0]['status'] == STATUS_SUCCESSFUL
     assert tasks[0]['retries'] == 0
 
-    logs = await get_tasks_log(postgres_url, test_schema_name)
+    logs = await get_tasks_log(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(logs) == 1
-    assert logs[0]['eta'] < datetime.now(tz=timezone.utc)
-    assert logs[0]['started'] < datetime.now(tz=timezone.utc)
-    assert logs[0]['finished'] < datetime.now(tz=timezone.utc)
+    assert logs[0]['eta'] < now
+    assert logs[0]['started'] < now
+    assert logs[0]['finished'] < now
     assert logs[0]['result'] == 123
     assert logs[0]['error'] is None
     assert logs[0]['traceback'] is None
 
-    assert len(await get_tasks_pending(postgres_url, test_schema_name)) == 0
+    assert await get_tasks_pending_count(pg_pool, test_schema_name) == 0
 
     await app.stop()
 
@@ -159,8 +170,10 @@ async def test_success(postgres_url: str, with_trace_id: bool):
     "with_trace_id",
     [True, False],
 )
-async def test_reties_success(postgres_url: str, with_trace_id: bool):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+async def test_reties_success(
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
+):
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
 
@@ -198,31 +211,32 @@ async def test_reties_success(postgres_url: str, with_trace_id: bool):
     res = await wait_for(fut, 10)
     assert res == 234
 
-    logs = await get_tasks_log(postgres_url, test_schema_name)
+    logs = await get_tasks_log(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(logs) == 3
 
-    assert logs[0]['eta'] < datetime.now(tz=timezone.utc)
-    assert logs[0]['started'] < datetime.now(tz=timezone.utc)
-    assert logs[0]['finished'] < datetime.now(tz=timezone.utc)
+    assert logs[0]['eta'] < now
+    assert logs[0]['started'] < now
+    assert logs[0]['finished'] < now
     assert logs[0]['result'] is None
     assert logs[0]['error'] == "Attempt 1"
     assert logs[0]['traceback'] is not None
 
-    assert logs[1]['eta'] < datetime.now(tz=timezone.utc)
-    assert logs[1]['started'] < datetime.now(tz=timezone.utc)
-    assert logs[1]['finished'] < datetime.now(tz=timezone.utc)
+    assert logs[1]['eta'] < now
+    assert logs[1]['started'] < now
+    assert logs[1]['finished'] < now
     assert logs[1]['result'] is None
     assert logs[1]['error'] == "Attempt 2"
     assert logs[1]['traceback'] is not None
 
-    assert logs[2]['eta'] < datetime.now(tz=timezone.utc)
-    assert logs[2]['started'] < datetime.now(tz=timezone.utc)
-    assert logs[2]['finished'] < datetime.now(tz=timezone.utc)
+    assert logs[2]['eta'] < now
+    assert logs[2]['started'] < now
+    assert logs[2]['finished'] < now
     assert logs[2]['result'] == 234
     assert logs[2]['error'] is None
     assert logs[2]['traceback'] is None
 
-    assert len(await get_tasks_pending(postgres_url, test_schema_name)) == 0
+    assert await get_tasks_pending_count(pg_pool, test_schema_name) == 0
 
     await app.stop()
 
@@ -231,8 +245,10 @@ async def test_reties_success(postgres_url: str, with_trace_id: bool):
     "with_trace_id",
     [True, False],
 )
-async def test_reties_error(postgres_url: str, with_trace_id: bool):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+async def test_reties_error(
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
+):
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
 
@@ -274,35 +290,37 @@ async def test_reties_error(postgres_url: str, with_trace_id: bool):
         retry_delay=0.2,
     )
 
-    await wait_no_pending(postgres_url, test_schema_name)
+    await wait_no_pending(pg_pool, test_schema_name)
 
-    tasks = await get_tasks_arch(postgres_url, test_schema_name)
+    tasks = await get_tasks_arch(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'someTest'
     assert tasks[0]['params'] == {'arg': 345}
-    assert tasks[0]['eta'] < datetime.now(tz=timezone.utc)
-    assert tasks[0]['last_stamp'] < datetime.now(tz=timezone.utc)
+    assert tasks[0]['eta'] < now
+    assert tasks[0]['last_stamp'] < now
     assert tasks[0]['status'] == STATUS_ERROR
     assert tasks[0]['retries'] == 1
 
-    logs = await get_tasks_log(postgres_url, test_schema_name)
+    logs = await get_tasks_log(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(logs) == 2
 
-    assert logs[0]['eta'] < datetime.now(tz=timezone.utc)
-    assert logs[0]['started'] < datetime.now(tz=timezone.utc)
-    assert logs[0]['finished'] < datetime.now(tz=timezone.utc)
+    assert logs[0]['eta'] < now
+    assert logs[0]['started'] < now
+    assert logs[0]['finished'] < now
     assert logs[0]['result'] is None
     assert logs[0]['error'] == "Attempt 1"
     assert logs[0]['traceback'] is not None
 
-    assert logs[1]['eta'] < datetime.now(tz=timezone.utc)
-    assert logs[1]['started'] < datetime.now(tz=timezone.utc)
-    assert logs[1]['finished'] < datetime.now(tz=timezone.utc)
+    assert logs[1]['eta'] < now
+    assert logs[1]['started'] < now
+    assert logs[1]['finished'] < now
     assert logs[1]['result'] is None
     assert logs[1]['error'] == "Attempt 2"
     assert logs[1]['traceback'] is not None
 
-    assert len(await get_tasks_pending(postgres_url, test_schema_name)) == 0
+    assert await get_tasks_pending_count(pg_pool, test_schema_name) == 0
 
     await app.stop()
 
@@ -311,8 +329,10 @@ async def test_reties_error(postgres_url: str, with_trace_id: bool):
     "with_trace_id",
     [True, False],
 )
-async def test_tasks_by_ref(postgres_url: str, with_trace_id: bool):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+async def test_tasks_by_ref(
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
+):
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
     reg = TaskRegistry()
@@ -340,7 +360,7 @@ async def test_tasks_by_ref(postgres_url: str, with_trace_id: bool):
     ref = str(uuid.uuid4())
 
     await tm.schedule(test, {'arg': 123}, eta=time.time() + 3, reference=ref)
-    tasks = await get_tasks_by_reference(postgres_url, test_schema_name, ref)
+    tasks = await get_tasks_by_reference(pg_pool, test_schema_name, ref)
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'test'
     assert tasks[0]['params'] == {'arg': 123}
@@ -349,7 +369,7 @@ async def test_tasks_by_ref(postgres_url: str, with_trace_id: bool):
     res = await wait_for(fut, 10)
     assert res == 123
 
-    tasks = await get_tasks_by_reference(postgres_url, test_schema_name, ref)
+    tasks = await get_tasks_by_reference(pg_pool, test_schema_name, ref)
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'test'
     assert tasks[0]['status'] == STATUS_SUCCESSFUL
@@ -361,8 +381,10 @@ async def test_tasks_by_ref(postgres_url: str, with_trace_id: bool):
     "with_trace_id",
     [True, False],
 )
-async def test_task_cancel(postgres_url: str, with_trace_id: bool):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+async def test_task_cancel(
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
+):
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
 
@@ -390,15 +412,14 @@ async def test_task_cancel(postgres_url: str, with_trace_id: bool):
 
     task_id = await tm.schedule(test123, {'arg': 123}, eta=time.time() + 600)
 
-    tasks = await get_tasks_pending(postgres_url, test_schema_name)
+    tasks = await get_tasks_pending(pg_pool, test_schema_name)
     assert len(tasks) == 1
 
     await tm.cancel(task_id)
 
-    tasks = await get_tasks_pending(postgres_url, test_schema_name)
-    assert len(tasks) == 0
+    assert await get_tasks_pending_count(pg_pool, test_schema_name) == 0
 
-    tasks = await get_tasks_arch(postgres_url, test_schema_name)
+    tasks = await get_tasks_arch(pg_pool, test_schema_name)
 
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'test123'
@@ -411,8 +432,10 @@ async def test_task_cancel(postgres_url: str, with_trace_id: bool):
     "with_trace_id",
     [True, False],
 )
-async def test_task_crontab(postgres_url: str, with_trace_id: bool):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+async def test_task_crontab(
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
+):
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
     count = []
@@ -441,13 +464,13 @@ async def test_task_crontab(postgres_url: str, with_trace_id: bool):
     res = await wait_for(fut, 10)
     assert res == 111
 
-    tasks = await get_tasks_arch(postgres_url, test_schema_name)
+    tasks = await get_tasks_arch(pg_pool, test_schema_name)
     assert len(tasks) == 2
 
-    logs = await get_tasks_log(postgres_url, test_schema_name)
+    logs = await get_tasks_log(pg_pool, test_schema_name)
     assert len(logs) == 2
 
-    assert len(await get_tasks_pending(postgres_url, test_schema_name)) == 0
+    assert await get_tasks_pending_count(pg_pool, test_schema_name) == 0
 
     await app.stop()
 
@@ -457,9 +480,9 @@ async def test_task_crontab(postgres_url: str, with_trace_id: bool):
     [True, False],
 )
 async def test_task_crontab_with_date_attr(
-    postgres_url: str, with_trace_id: bool
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
 ):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
     count = []
@@ -491,13 +514,13 @@ async def test_task_crontab_with_date_attr(
 
     assert count[0] < count[1]
 
-    tasks = await get_tasks_arch(postgres_url, test_schema_name)
+    tasks = await get_tasks_arch(pg_pool, test_schema_name)
     assert len(tasks) == 2
 
-    logs = await get_tasks_log(postgres_url, test_schema_name)
+    logs = await get_tasks_log(pg_pool, test_schema_name)
     assert len(logs) == 2
 
-    assert len(await get_tasks_pending(postgres_url, test_schema_name)) == 0
+    assert await get_tasks_pending_count(pg_pool, test_schema_name) == 0
 
     await app.stop()
 
@@ -506,8 +529,10 @@ async def test_task_crontab_with_date_attr(
     "with_trace_id",
     [True, False],
 )
-async def test_decorator(postgres_url: str, with_trace_id: bool):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+async def test_decorator(
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
+):
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
 
@@ -543,37 +568,40 @@ async def test_decorator(postgres_url: str, with_trace_id: bool):
     tm: TaskManager = app.get('tm')  # type: ignore
 
     await tm.schedule(test, {'arg': 123}, eta=time.time() + 3)
-    tasks = await get_tasks_pending(postgres_url, test_schema_name)
+    tasks = await get_tasks_pending(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'test'
     assert tasks[0]['params'] == {'arg': 123}
-    assert tasks[0]['eta'] > datetime.now(tz=timezone.utc)
-    assert tasks[0]['last_stamp'] < datetime.now(tz=timezone.utc)
+    assert tasks[0]['eta'] > now
+    assert tasks[0]['last_stamp'] < now
     assert tasks[0]['status'] == STATUS_PENDING
     assert tasks[0]['retries'] is None
 
     res = await wait_for(fut, 10)
     assert res == 123
 
-    tasks = await get_tasks_arch(postgres_url, test_schema_name)
+    tasks = await get_tasks_arch(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'test'
     assert tasks[0]['params'] == {'arg': 123}
-    assert tasks[0]['eta'] < datetime.now(tz=timezone.utc)
-    assert tasks[0]['last_stamp'] < datetime.now(tz=timezone.utc)
+    assert tasks[0]['eta'] < now
+    assert tasks[0]['last_stamp'] < now
     assert tasks[0]['status'] == STATUS_SUCCESSFUL
     assert tasks[0]['retries'] == 0
 
-    logs = await get_tasks_log(postgres_url, test_schema_name)
+    logs = await get_tasks_log(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(logs) == 1
-    assert logs[0]['eta'] < datetime.now(tz=timezone.utc)
-    assert logs[0]['started'] < datetime.now(tz=timezone.utc)
-    assert logs[0]['finished'] < datetime.now(tz=timezone.utc)
+    assert logs[0]['eta'] < now
+    assert logs[0]['started'] < now
+    assert logs[0]['finished'] < now
     assert logs[0]['result'] == 123
     assert logs[0]['error'] is None
     assert logs[0]['traceback'] is None
 
-    assert len(await get_tasks_pending(postgres_url, test_schema_name)) == 0
+    assert await get_tasks_pending_count(pg_pool, test_schema_name) == 0
 
     await app.stop()
 
@@ -582,8 +610,10 @@ async def test_decorator(postgres_url: str, with_trace_id: bool):
     "with_trace_id",
     [True, False],
 )
-async def test_propagate_trace(postgres_url: str, with_trace_id: bool):
-    test_schema_name = await prepare(postgres_url, with_trace_id=with_trace_id)
+async def test_propagate_trace(
+    postgres_url: str, pg_pool: asyncpg.Pool, with_trace_id: bool
+):
+    test_schema_name = await prepare(pg_pool, with_trace_id=with_trace_id)
 
     fut = Future()
 
@@ -631,12 +661,13 @@ async def test_propagate_trace(postgres_url: str, with_trace_id: bool):
                 # stop test
                 return
             trace = [trap.span.trace_id, trap.span.id]
-    tasks = await get_tasks_pending(postgres_url, test_schema_name)
+    tasks = await get_tasks_pending(pg_pool, test_schema_name)
+    now = datetime.now(tz=timezone.utc)
     assert len(tasks) == 1
     assert tasks[0]['name'] == 'test'
     assert tasks[0]['params'] == {'arg': 123}
-    assert tasks[0]['eta'] > datetime.now(tz=timezone.utc)
-    assert tasks[0]['last_stamp'] < datetime.now(tz=timezone.utc)
+    assert tasks[0]['eta'] > now
+    assert tasks[0]['last_stamp'] < now
     assert tasks[0]['status'] == STATUS_PENDING
     assert tasks[0]['retries'] is None
     assert tasks[0]['trace_id'] == trace[0]